@@ -9,9 +9,6 @@ This file demonstrates:
 
 import time
 
-import torch
-import torch.nn as nn
-
 from runpod_serverless_template import BaseHandler, BaseModel
 
 
@@ -23,6 +20,13 @@ class MyCustomModel(BaseModel):
     like TensorFlow, JAX, ONNX, etc.
     """
 
+    # Metadata added to every response
+    _METADATA_TEMPLATE = {
+        "model_name": "MyCustomModel",
+        "version": "1.0.0",
+        "framework": "PyTorch",
+    }
+
     def _initialize_model(self):
         """
         Initialize the model with custom logic.
@@ -32,6 +36,13 @@ class MyCustomModel(BaseModel):
         """
         print("Loading MyCustomModel...")
 
+        # Import heavy frameworks here rather than at module level, so importing
+        # this module stays cheap and the cost is paid once at model load
+        import torch
+        import torch.nn as nn
+
+        self._torch = torch
+
         # Example: Load a PyTorch model
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 
@@ -43,6 +54,19 @@ class MyCustomModel(BaseModel):
         # Example: Load weights from a file
         # self.model.load_state_dict(torch.load("model_weights.pth"))
 
+        # Put the model in inference mode (disables dropout, batchnorm updates)
+        self.model.eval()
+
+        # Example: Compile the model for fused kernels (PyTorch 2.x)
+        # self.model = torch.compile(self.model)
+
+        # Inference implementation for each preprocessed input type
+        self._inference_dispatch = {
+            torch.Tensor: self._infer_tensor,
+            str: self._infer_text,
+            dict: self._infer_dict,
+        }
+
         print(f"Model loaded on {self.device}")
 
     def preprocess(self, input_data):
@@ -52,22 +76,21 @@ class MyCustomModel(BaseModel):
         This method takes the raw input from the API request and
         prepares it for the model.
         """
-        # Handle different input types
+        # Handle different input types. Only feature vectors need custom handling;
+        # text, image_url and other inputs go straight to the base class, which
+        # downloads and processes images and cleans up text.
         if "features" in input_data:
-            # For vector inputs (e.g., feature vectors)
-            features = input_data["features"]
-            return torch.tensor(features, dtype=torch.float32).to(self.device)
-        elif "text" in input_data:
-            # Example: Process text input - this would typically involve tokenization
-            # For this example, we'll just return the text for the parent class to handle
-            return super().preprocess(input_data)
-        elif "image_url" in input_data:
-            # For image inputs, use the parent class implementation
-            # which downloads and processes the image
-            return super().preprocess(input_data)
-        else:
-            # Fall back to base class for other input types
-            return super().preprocess(input_data)
+            return self._preprocess_features(input_data["features"])
+        return super().preprocess(input_data)
+
+    def _preprocess_features(self, features):
+        """For vector inputs (e.g., feature vectors)."""
+        torch = self._torch
+        features = torch.as_tensor(features, dtype=torch.float32)
+        if self.device.type == "cuda":
+            # Pinned host memory lets the copy to the GPU run asynchronously
+            features = features.pin_memory()
+        return features.to(self.device, non_blocking=True)
 
     def _run_inference(self, processed_input):
         """
@@ -76,68 +99,101 @@ class MyCustomModel(BaseModel):
         This method is called after preprocessing and should return the raw model output.
         """
         # Different handling based on input type
-        if isinstance(processed_input, torch.Tensor):
-            # For tensor inputs (feature vectors)
-            with torch.no_grad():
-                output = self.model(processed_input)
-                return output.cpu().numpy().tolist()
-        elif isinstance(processed_input, str):
-            # Example text processing
-            return {
-                "text_analysis": f"Analyzed: {processed_input}",
-                "sentiment": 0.8,
-                "length": len(processed_input),
-            }
-        elif isinstance(processed_input, dict):
-            # Generic input
-            return {
-                "result": "Generic processing completed",
-                "input_type": "dictionary",
-            }
-        else:
-            # Generic fallback
-            return {
-                "result": "Processed with default handler",
-                "input_type": str(type(processed_input)),
-            }
+        infer = self._inference_dispatch.get(type(processed_input), self._infer_default)
+        return infer(processed_input)
+
+    def _infer_tensor(self, features):
+        """For tensor inputs (feature vectors)."""
+        with self._torch.inference_mode():
+            output = self.model(features)
+            return output.cpu().numpy().tolist()
+
+    def _infer_text(self, text):
+        """Example text processing."""
+        return {
+            "text_analysis": f"Analyzed: {text}",
+            "sentiment": 0.8,
+            "length": len(text),
+        }
+
+    def _infer_dict(self, data):
+        """Generic input."""
+        return {
+            "result": "Generic processing completed",
+            "input_type": "dictionary",
+        }
+
+    def _infer_default(self, processed_input):
+        """Generic fallback."""
+        return {
+            "result": "Processed with default handler",
+            "input_type": type(processed_input).__name__,
+        }
+
+    def _run_inference_batch(self, processed_inputs):
+        """
+        Run inference on several inputs with a single forward pass.
 
-    def postprocess(self, output):
+        This is called for batch requests with inputs of the same type and shape,
+        so feature vectors can be stacked and sent to the GPU together.
+        """
+        torch = self._torch
+        if not isinstance(processed_inputs[0], torch.Tensor):
+            return [self._run_inference(item) for item in processed_inputs]
+
+        stacked = torch.stack(processed_inputs)
+        with torch.inference_mode():
+            output = self.model(stacked)
+        return output.cpu().numpy().tolist()
+
+    def postprocess(self, output, gcs_signed_url=None):
         """
         Format the model output for the API response.
 
         This method takes the raw model output and formats it into the final
         API response structure.
         """
+        # Read the clock once per call
+        timestamp = time.time()
+
         # Add metadata to enrich the response
         if isinstance(output, dict):
-            output.update(
-                {
-                    "model_name": "MyCustomModel",
-                    "version": "1.0.0",
-                    "framework": "PyTorch",
-                    "timestamp": time.time(),
-                }
-            )
+            output.update(self._METADATA_TEMPLATE)
+            output["timestamp"] = timestamp
         else:
             # If output is not a dict, wrap it
             output = {
                 "prediction": output,
-                "model_name": "MyCustomModel",
-                "version": "1.0.0",
-                "framework": "PyTorch",
-                "timestamp": time.time(),
+                **self._METADATA_TEMPLATE,
+                "timestamp": timestamp,
             }
 
-        return output
+        # Let the base class handle GCS uploads
+        return super().postprocess(output, gcs_signed_url)
+
+
+# The model is loaded once per worker and the same handler serves every event.
+_HANDLER = None
+
+
+def get_handler():
+    """
+    Get the handler for this worker, creating it on first use.
+
+    Pass the returned handler to runpod.serverless.start; don't pass a function
+    that builds a new model per event, or the model is reloaded every request.
+    """
+    global _HANDLER
+    if _HANDLER is None:
+        # 1. Create an instance of your custom model
+        # 2. Create a handler with your model
+        _HANDLER = BaseHandler(MyCustomModel())
+    return _HANDLER
 
 
 # Example of how to use this model in a handler.py file:
 if __name__ == "__main__":
-    # 1. Create an instance of your custom model
-    model = MyCustomModel()
-
-    # 2. Create a handler with your model
-    handler = BaseHandler(model)
+    handler = get_handler()
 
     # 3. Start the serverless function
     import runpod
@@ -8,12 +8,18 @@ This shows:
 4. How to add custom error context
 """
 
+import re
+import sys
 import time
 
 import numpy as np
 
 from runpod_serverless_template import BaseModel, BatchBaseHandler
 
+# Case-insensitive triggers for the demo failure modes
+_CRASH_RE = re.compile("crash", re.IGNORECASE)
+_MEMORY_RE = re.compile("memory", re.IGNORECASE)
+
 
 class BasicErrorHandlingModel(BaseModel):
     """Basic model using default error handling."""
@@ -25,9 +31,9 @@ class BasicErrorHandlingModel(BaseModel):
     def _run_inference(self, processed_input):
         # This model intentionally has some failure modes for demonstration
         if isinstance(processed_input, str):
-            if "crash" in processed_input.lower():
+            if _CRASH_RE.search(processed_input):
                 raise RuntimeError("Model crashed due to input containing 'crash'")
-            elif "memory" in processed_input.lower():
+            elif _MEMORY_RE.search(processed_input):
                 raise MemoryError("Out of memory processing this input")
             else:
                 return {"text_analysis": f"Processed: {processed_input}"}
@@ -79,6 +85,10 @@ class CustomErrorHandlingModel(BaseModel):
 
     def _get_error_context(self, error, stage, input_data):
         """Add custom error context."""
+        # Debugging context is only collected along with tracebacks
+        if not self.include_traceback:
+            return {}
+
         # Get base context
         context = super()._get_error_context(error, stage, input_data)
 
@@ -121,7 +131,13 @@ class CustomErrorHandlingModel(BaseModel):
     def _get_stage_info(self, stage, input_data):
         """Get stage-specific debugging information."""
         if stage == "preprocess":
-            return {"input_size": len(str(input_data)) if input_data else 0}
+            # Report the size without string-formatting the whole input
+            if input_data is None:
+                return {"input_size": 0}
+            input_size = getattr(input_data, "nbytes", None)
+            if input_size is None:
+                input_size = sys.getsizeof(input_data)
+            return {"input_size": input_size}
         elif stage == "inference":
             return {"input_type": type(input_data).__name__}
         elif stage == "postprocess":
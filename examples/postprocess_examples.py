@@ -10,6 +10,7 @@ The postprocess method is where you:
 """
 
 import json
+import re
 import time
 
 import numpy as np
@@ -17,6 +18,36 @@ from PIL import Image
 
 from runpod_serverless_template import BaseModel
 
+# Sentiment labels, in the order of the text model's logits
+_SENTIMENT_LABELS = ("negative", "positive", "neutral", "mixed")
+
+# Object detection class names, indexed by class id
+_CLASS_NAMES = ("background", "person", "car", "dog", "cat")
+
+# Static metadata attached to every result. Each result gets its own copy, so
+# callers can modify it without affecting other results.
+_TEXT_MODEL_INFO = {
+    "version": "1.2.0",
+    "architecture": "transformer-based",
+    "last_updated": "2024-01-15",
+}
+_GENERATION_INFO = {
+    "model_type": "diffusion",
+    "format": "RGB",
+    "quality_score": 0.85,  # Simulated quality assessment
+}
+_DETECTION_MODEL_METADATA = {
+    "architecture": "YOLO-v8",
+    "input_size": "640x640",
+    "num_classes": len(_CLASS_NAMES),
+}
+
+# Prompts asking the multi-modal model for an image
+_GENERATE_IMAGE_RE = re.compile("generate image", re.IGNORECASE)
+
+# Prompts announce the mode up front, so only this many characters are scanned
+_PROMPT_SCAN_CHARS = 256
+
 
 class TextAnalysisModel(BaseModel):
     """Example: Text analysis model with rich postprocessing."""
@@ -28,8 +59,9 @@ class TextAnalysisModel(BaseModel):
         # Simulate model output
         return {
             "logits": [0.1, 0.8, 0.05, 0.05],  # Raw probabilities
-            "embeddings": np.random.rand(512).tolist(),
-            "attention_weights": np.random.rand(20, 20).tolist(),
+            # Keep tensors as arrays; only what ends up in the result is listified
+            "embeddings": np.random.rand(512).astype(np.float32),
+            "attention_weights": np.random.rand(20, 20).astype(np.float32),
         }
 
     def postprocess(self, output, gcs_signed_url=None):
@@ -41,25 +73,19 @@ class TextAnalysisModel(BaseModel):
         embeddings = output["embeddings"]
 
         # Convert logits to human-readable predictions
-        sentiment_labels = ["negative", "positive", "neutral", "mixed"]
+        sentiment_labels = _SENTIMENT_LABELS
         confidence_scores = self._softmax(logits)
-        predicted_class = sentiment_labels[np.argmax(confidence_scores)]
-        max_confidence = float(np.max(confidence_scores))
+        predicted_idx = int(confidence_scores.argmax())
+        predicted_class = sentiment_labels[predicted_idx]
+        max_confidence = float(confidence_scores[predicted_idx])
 
         # Create structured result
         result = {
             "sentiment": predicted_class,
             "confidence": max_confidence,
-            "all_scores": {
-                label: float(score)
-                for label, score in zip(sentiment_labels, confidence_scores)
-            },
-            "embedding_preview": embeddings[:10],  # First 10 dimensions only
-            "model_info": {
-                "version": "1.2.0",
-                "architecture": "transformer-based",
-                "last_updated": "2024-01-15",
-            },
+            "all_scores": dict(zip(sentiment_labels, confidence_scores.tolist())),
+            "embedding_preview": embeddings[:10].tolist(),  # First 10 dimensions only
+            "model_info": dict(_TEXT_MODEL_INFO),
         }
 
         # Handle GCS upload - the parent class will automatically determine
@@ -68,8 +94,12 @@ class TextAnalysisModel(BaseModel):
 
     def _softmax(self, logits):
         """Apply softmax to convert logits to probabilities."""
-        exp_logits = np.exp(np.array(logits) - np.max(logits))
-        return exp_logits / np.sum(exp_logits)
+        # Work in place on a single float32 array
+        x = np.array(logits, dtype=np.float32)
+        x -= x.max()
+        np.exp(x, out=x)
+        x /= x.sum()
+        return x
 
 
 class ImageGenerationModel(BaseModel):
@@ -77,12 +107,15 @@ class ImageGenerationModel(BaseModel):
 
     def _initialize_model(self):
         print("Loading image generation model...")
+        self._rng = np.random.default_rng()
 
     def _run_inference(self, processed_input):
         # Simulate generating an image
         height, width = 512, 512
-        # Create a sample image (in practice this would be your model output)
-        image_array = np.random.rand(height, width, 3)
+        # Create a sample image (in practice this would be your model output).
+        # Each call returns a new array: batch items may be postprocessed
+        # after later items have already run inference.
+        image_array = self._rng.random((height, width, 3), dtype=np.float32)
         return {
             "generated_image": image_array,
             "seed": 12345,
@@ -97,10 +130,16 @@ class ImageGenerationModel(BaseModel):
         # Extract the generated image
         image_array = output["generated_image"]
 
-        # Convert to proper image format
-        if image_array.max() <= 1.0:
-            # Convert from [0,1] to [0,255]
-            image_array = (image_array * 255).astype(np.uint8)
+        # Convert to proper image format. uint8 images are already in range,
+        # so only floating-point output pays for the full-image max() scan.
+        if image_array.dtype.kind == "f" and image_array.max() <= 1.0:
+            # Convert from [0,1] to [0,255], writing straight into a uint8 array
+            image_array = np.multiply(
+                image_array,
+                255,
+                out=np.empty(image_array.shape, dtype=np.uint8),
+                casting="unsafe",
+            )
 
         # Create metadata
         result = {
@@ -112,11 +151,7 @@ class ImageGenerationModel(BaseModel):
                 "image_size": f"{image_array.shape[1]}x{image_array.shape[0]}",
                 "channels": image_array.shape[2] if len(image_array.shape) > 2 else 1,
             },
-            "generation_info": {
-                "model_type": "diffusion",
-                "format": "RGB",
-                "quality_score": 0.85,  # Simulated quality assessment
-            },
+            "generation_info": dict(_GENERATION_INFO),
         }
 
         # Handle GCS upload - the parent class will detect this is an image
@@ -143,31 +178,39 @@ class ObjectDetectionModel(BaseModel):
         """
         Postprocess object detection results.
         """
-        boxes = output["boxes"]
-        scores = output["scores"]
-        class_ids = output["class_ids"]
+        # Class names indexed by class id
+        class_names = _CLASS_NAMES
 
-        # Class mapping
-        class_names = {0: "background", 1: "person", 2: "car", 3: "dog", 4: "cat"}
-
-        # Filter low-confidence detections
+        # Filter low-confidence detections with a single vectorized mask
         confidence_threshold = 0.5
-        filtered_detections = []
-
-        for box, score, class_id in zip(boxes, scores, class_ids):
-            if score >= confidence_threshold:
-                detection = {
-                    "bbox": {
-                        "x": box[0],
-                        "y": box[1],
-                        "width": box[2] - box[0],
-                        "height": box[3] - box[1],
-                    },
-                    "confidence": float(score),
-                    "class_name": class_names.get(class_id, f"unknown_{class_id}"),
-                    "class_id": int(class_id),
-                }
-                filtered_detections.append(detection)
+        # Keep the detector's coordinate dtype (usually float) so fractional
+        # coordinates are passed through unchanged
+        boxes = np.asarray(output["boxes"]).reshape(-1, 4)
+        scores = np.asarray(output["scores"], dtype=np.float64)
+        class_ids = np.asarray(output["class_ids"], dtype=np.int32)
+        keep = scores >= confidence_threshold
+        boxes, scores, class_ids = boxes[keep], scores[keep], class_ids[keep]
+        sizes = boxes[:, 2:] - boxes[:, :2]
+
+        # Build the detections from plain Python values (one .tolist() per array)
+        filtered_detections = [
+            {
+                "bbox": {"x": x, "y": y, "width": width, "height": height},
+                "confidence": score,
+                "class_name": (
+                    class_names[class_id]
+                    if 0 <= class_id < len(class_names)
+                    else f"unknown_{class_id}"
+                ),
+                "class_id": class_id,
+            }
+            for (x, y), (width, height), score, class_id in zip(
+                boxes[:, :2].tolist(),
+                sizes.tolist(),
+                scores.tolist(),
+                class_ids.tolist(),
+            )
+        ]
 
         # Create comprehensive result
         result = {
@@ -179,11 +222,7 @@ class ObjectDetectionModel(BaseModel):
                     set(d["class_name"] for d in filtered_detections)
                 ),
             },
-            "model_metadata": {
-                "architecture": "YOLO-v8",
-                "input_size": "640x640",
-                "num_classes": len(class_names),
-            },
+            "model_metadata": dict(_DETECTION_MODEL_METADATA),
         }
 
         # This will be uploaded as JSON since it's structured data
@@ -195,16 +234,18 @@ class MultiModalModel(BaseModel):
 
     def _initialize_model(self):
         print("Loading multi-modal model...")
+        self._rng = np.random.default_rng()
 
     def _run_inference(self, processed_input):
-        if (
-            isinstance(processed_input, str)
-            and "generate image" in processed_input.lower()
+        if isinstance(processed_input, str) and _GENERATE_IMAGE_RE.search(
+            processed_input, 0, _PROMPT_SCAN_CHARS
         ):
-            # Generate an image
+            # Generate a new image (outputs must not share a buffer, since
+            # batch items may be postprocessed after later inferences)
+            image_data = self._rng.random((256, 256, 3), dtype=np.float32)
             return {
                 "type": "image",
-                "data": np.random.rand(256, 256, 3),
+                "data": image_data,
                 "prompt": processed_input,
             }
         else:
@@ -224,8 +265,13 @@ class MultiModalModel(BaseModel):
         if output_type == "image":
             # Handle image output
             image_data = output["data"]
-            if image_data.max() <= 1.0:
-                image_data = (image_data * 255).astype(np.uint8)
+            if image_data.dtype.kind == "f" and image_data.max() <= 1.0:
+                image_data = np.multiply(
+                    image_data,
+                    255,
+                    out=np.empty(image_data.shape, dtype=np.uint8),
+                    casting="unsafe",
+                )
 
             result = {
                 "prediction": image_data,  # Will be uploaded as image
@@ -243,7 +289,7 @@ class MultiModalModel(BaseModel):
             }
 
         # Add common metadata
-        result["processing_timestamp"] = time.time()
+        result["processing_timestamp_ns"] = time.time_ns()
         result["model_version"] = "multimodal-v2.1"
 
         return super().postprocess(result, gcs_signed_url)
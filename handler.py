@@ -1,5 +1,10 @@
 #!/usr/bin/env python
 
+import asyncio
+import logging
+import os
+import threading
+
 import runpod
 
 from examples.custom_model_example import MyCustomModel
@@ -11,13 +16,70 @@ from runpod_serverless_template import BaseHandler
 # To use this template, create a custom model class inheriting from BaseModel
 # and update the imports and initialization below.
 
+# Number of jobs this worker runs at the same time. Each job runs on its own
+# thread, so only raise this if the model can predict concurrently (e.g. its
+# framework releases the GIL, or jobs mostly wait on downloads and uploads).
+MAX_CONCURRENCY = max(1, int(os.environ.get("MAX_CONCURRENCY", "1")))
+
+_base_handler = None
+_base_handler_lock = threading.Lock()
+
+
+def get_handler():
+    """
+    Get the handler, initializing the model on first use.
+
+    Importing this module doesn't load the model, so the worker can start
+    while the weights load (see __main__ below).
+
+    Returns:
+        BaseHandler: The handler for the model
+    """
+    global _base_handler
+    if _base_handler is None:
+        with _base_handler_lock:
+            if _base_handler is None:
+                # Initialize the model and create a handler with it
+                _base_handler = BaseHandler(MyCustomModel())
+    return _base_handler
+
+
+def handler(event):
+    """
+    Handle a RunPod job, waiting for the model to finish loading if needed.
+
+    Args:
+        event (dict): Input event data from RunPod
+
+    Returns:
+        dict: The response to send back
+    """
+    return get_handler()(event)
+
+
+async def async_handler(event):
+    """
+    Handle a RunPod job on a worker thread, leaving the event loop free to
+    accept other jobs (see MAX_CONCURRENCY).
+
+    Args:
+        event (dict): Input event data from RunPod
 
-# Initialize the model
-model = MyCustomModel()
+    Returns:
+        dict: The response to send back
+    """
+    return await asyncio.to_thread(handler, event)
 
-# Create a handler with your model
-handler = BaseHandler(model)
 
 # Start the serverless function
 if __name__ == "__main__":
-    runpod.serverless.start({"handler": handler})
+    # Set LOG_LEVEL=DEBUG to log full request and response payloads
+    logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO").upper())
+    # Load the model in the background while the worker starts up
+    threading.Thread(target=get_handler, daemon=True).start()
+    runpod.serverless.start(
+        {
+            "handler": async_handler,
+            "concurrency_modifier": lambda current_concurrency: MAX_CONCURRENCY,
+        }
+    )
@@ -9,6 +9,7 @@ __version__ = "0.1.0"
 from runpod_serverless_template.core.handler import BaseHandler, BatchBaseHandler
 from runpod_serverless_template.core.model import BaseModel
 from runpod_serverless_template.utils import (
+    upload_array_to_signed_url,
     upload_image_to_signed_url,
     upload_to_signed_url,
 )
@@ -19,4 +20,5 @@ __all__ = [
     "BaseModel",
     "upload_to_signed_url",
     "upload_image_to_signed_url",
+    "upload_array_to_signed_url",
 ]
@@ -2,8 +2,15 @@
 Base handler for RunPod serverless endpoints.
 """
 
+import atexit
 import base64
+import logging
 import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
 
@@ -11,6 +18,227 @@ from runpod_serverless_template.utils.gcs import (
     upload_image_to_signed_url,
     upload_to_signed_url,
 )
+from runpod_serverless_template.utils.http import get_session
+from runpod_serverless_template.utils.serialization import json_dumps, json_loads
+
+logger = logging.getLogger(__name__)
+
+# Runs the GCS upload concurrently with the callback request
+_IO_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="handler-io")
+
+# (connect, read) timeouts in seconds for callback requests
+CALLBACK_TIMEOUT = (3.05, 10)
+
+# Chunk size used to discard callback response bodies
+CALLBACK_DRAIN_CHUNK_SIZE = 16 * 1024
+
+# How long (in seconds) and how many successful results are kept, so that a
+# retried job id gets its earlier result back instead of running again
+COMPLETED_JOB_TTL = 300
+COMPLETED_JOB_CACHE_SIZE = 128
+
+# Largest serialized result (in bytes) that is cached. Bigger results, such as
+# inline base64 images, would pin too much memory and are just run again.
+COMPLETED_JOB_MAX_BYTES = 64 * 1024
+
+# Recently completed results by job id, oldest first, as (time, serialized
+# payload). Payloads are stored serialized so that every retry gets its own
+# copy, and nothing can modify the cached result.
+_COMPLETED_JOBS = OrderedDict()
+_COMPLETED_JOBS_LOCK = threading.Lock()
+
+# Headers for callbacks that don't carry a token
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Maximum time (in seconds) spent at shutdown sending queued background
+# callbacks (see callback_async)
+CALLBACK_FLUSH_TIMEOUT = 5
+
+# Background callbacks waiting to be sent, as (job ID, send function, args)
+_CALLBACK_QUEUE = queue.Queue()
+# Job ID of the background callback currently being sent
+_CALLBACK_IN_FLIGHT = None
+_CALLBACK_WORKER = None
+_CALLBACK_WORKER_LOCK = threading.Lock()
+
+
+def _post_json(session, url, payload, headers, body=None):
+    """
+    POST a payload to a URL as JSON.
+
+    The payload is serialized with json_dumps (orjson when installed, which
+    also handles numpy values in model outputs), unless it has already been
+    serialized.
+
+    Args:
+        session (requests.Session): Session to send the request with
+        url (str): URL to send the payload to
+        payload (dict): The payload to send
+        headers (dict): Request headers, including the JSON content type
+        body (bytes, optional): The payload already serialized to JSON
+
+    Raises:
+        requests.RequestException: If the request fails or returns an error status
+    """
+    if body is None:
+        body = json_dumps(payload)
+
+    with session.post(
+        url,
+        data=body,
+        headers=headers,
+        timeout=CALLBACK_TIMEOUT,
+        stream=True,
+    ) as response:
+        response.raise_for_status()
+
+        # The acknowledgement body is never used. Discard it in chunks rather
+        # than buffering it, so the connection can still go back to the pool.
+        for _ in response.iter_content(CALLBACK_DRAIN_CHUNK_SIZE):
+            pass
+
+
+def _describe_callback_error(error):
+    """
+    Describe a failed callback request for the response payload.
+
+    Args:
+        error (Exception): The error raised while sending the callback
+
+    Returns:
+        str: "timeout" if the callback host didn't respond within
+        CALLBACK_TIMEOUT, otherwise the error message
+    """
+    if isinstance(error, requests.exceptions.Timeout):
+        return "timeout"
+    return str(error)
+
+
+def _send_queued_callbacks():
+    """
+    Send queued background callbacks, one at a time, for as long as the
+    process runs.
+    """
+    global _CALLBACK_IN_FLIGHT
+    while True:
+        job_id, send, args = _CALLBACK_QUEUE.get()
+        _CALLBACK_IN_FLIGHT = job_id
+        try:
+            send(*args)
+        except Exception as callback_error:
+            logger.error(
+                "Dropping queued callback for job %s: %s", job_id, callback_error
+            )
+        finally:
+            _CALLBACK_IN_FLIGHT = None
+            _CALLBACK_QUEUE.task_done()
+
+
+def _queue_callback(job_id, send, *args):
+    """
+    Queue a callback to be sent in the background.
+
+    Args:
+        job_id (str): ID of the job the callback is for, used in logs
+        send (callable): Function that sends the callback
+        *args: Arguments to call it with
+    """
+    global _CALLBACK_WORKER
+    if _CALLBACK_WORKER is None:
+        with _CALLBACK_WORKER_LOCK:
+            if _CALLBACK_WORKER is None:
+                _CALLBACK_WORKER = threading.Thread(
+                    target=_send_queued_callbacks, name="callback-sender", daemon=True
+                )
+                _CALLBACK_WORKER.start()
+    _CALLBACK_QUEUE.put((job_id, send, args))
+
+
+def flush_callbacks(timeout=CALLBACK_FLUSH_TIMEOUT):
+    """
+    Wait for queued background callbacks to be sent.
+
+    Runs automatically at interpreter exit, so callbacks queued just before
+    the worker shuts down aren't dropped. Callbacks that aren't sent within
+    the timeout are removed from the queue and logged with their job ID.
+
+    Args:
+        timeout (float): Maximum number of seconds to wait
+
+    Returns:
+        bool: True if all queued callbacks were sent within the timeout
+    """
+    deadline = time.monotonic() + timeout
+    with _CALLBACK_QUEUE.all_tasks_done:
+        while _CALLBACK_QUEUE.unfinished_tasks:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            _CALLBACK_QUEUE.all_tasks_done.wait(remaining)
+        else:
+            return True
+
+    # Out of time: drop the callbacks that haven't been started
+    while True:
+        try:
+            job_id, _, _ = _CALLBACK_QUEUE.get_nowait()
+        except queue.Empty:
+            break
+        logger.warning("Dropping unsent callback for job %s", job_id)
+        _CALLBACK_QUEUE.task_done()
+    in_flight = _CALLBACK_IN_FLIGHT
+    if in_flight is not None:
+        logger.warning("Dropping callback for job %s, still being sent", in_flight)
+    return False
+
+
+atexit.register(flush_callbacks)
+
+
+def _get_completed_job(job_id):
+    """
+    Get the cached result of a recently completed job.
+
+    Args:
+        job_id (str): The RunPod job id
+
+    Returns:
+        dict or None: The job's result payload, or None if it isn't cached
+    """
+    with _COMPLETED_JOBS_LOCK:
+        entry = _COMPLETED_JOBS.get(job_id)
+        if entry is None:
+            return None
+        completed_at, serialized_payload = entry
+        if time.monotonic() - completed_at > COMPLETED_JOB_TTL:
+            del _COMPLETED_JOBS[job_id]
+            return None
+    return json_loads(serialized_payload)
+
+
+def _store_completed_job(job_id, payload):
+    """
+    Cache the result of a completed job, evicting the oldest entries.
+
+    Caching is best-effort: results larger than COMPLETED_JOB_MAX_BYTES once
+    serialized, or that can't be serialized, aren't cached.
+
+    Args:
+        job_id (str): The RunPod job id
+        payload (dict): The job's result payload
+    """
+    try:
+        serialized_payload = json_dumps(payload)
+    except Exception as e:
+        logger.warning("Not caching result of job %s: %s", job_id, e)
+        return
+    if len(serialized_payload) > COMPLETED_JOB_MAX_BYTES:
+        return
+    with _COMPLETED_JOBS_LOCK:
+        _COMPLETED_JOBS[job_id] = (time.monotonic(), serialized_payload)
+        _COMPLETED_JOBS.move_to_end(job_id)
+        while len(_COMPLETED_JOBS) > COMPLETED_JOB_CACHE_SIZE:
+            _COMPLETED_JOBS.popitem(last=False)
 
 
 class BaseHandler:
@@ -23,6 +251,14 @@ class BaseHandler:
     - Result delivery (direct response, callback, or GCS upload)
     """
 
+    # Set to True to keep the object a model uploaded to the GCS signed URL
+    # itself (see BaseModel.postprocess) instead of replacing it with the
+    # response payload.
+    keep_model_upload = False
+    # Set to True to upload to GCS while the callback is sent. The callback
+    # then no longer reports the "gcs_upload" status.
+    parallel_upload = False
+
     def __init__(self, model_instance):
         """
         Initialize the handler with a model instance.
@@ -31,10 +267,16 @@ class BaseHandler:
             model_instance: An instance of a class that implements the BaseModel interface
         """
         self.model = model_instance
+        self.session = get_session()
         self.callback_token = os.environ.get(
             "RUNPOD_CALLBACK_TOKEN", os.environ.get("CALLBACK_TOKEN")
         )
 
+        # Prepare callback headers once, with callback token if available
+        self._callback_headers = {"Content-Type": "application/json"}
+        if self.callback_token:
+            self._callback_headers["Authorization"] = f"Bearer {self.callback_token}"
+
     def __call__(self, event):
         """
         Handle the incoming request.
@@ -45,19 +287,45 @@ class BaseHandler:
         Returns:
             dict: The response to send back
         """
-        try:
-            # Extract input data
-            input_data = event.get("input", {})
-            callback_url = input_data.get("callback_url")
-            gcs_signed_url = input_data.get("gcs_signed_url")
+        # Extract input data. Delivery targets are resolved up front so that
+        # errors are reported to the same place a result would have gone.
+        input_data = event.get("input") or {}
+        if isinstance(input_data, list):
+            # A list of inputs is run as a single batch (see BaseModel.predict)
+            input_data = {"batch": input_data}
+        elif not isinstance(input_data, dict):
+            return {"error": "Input must be an object or a list of inputs"}
+        callback_url = input_data.get("callback_url")
+        gcs_signed_url = input_data.get("gcs_signed_url")
+        job_id = event.get("id", "unknown")
+        # Whether the result already reached the GCS signed URL (or is on its
+        # way there), in which case a later error must not overwrite it
+        result_uploaded = False
 
-            print("BaseHandler __call__", event)
-            print("BaseHandler __call__", input_data, callback_url, gcs_signed_url)
+        try:
+            # Arguments are only formatted if debug logging is enabled, so
+            # large events cost nothing in production
+            logger.debug("BaseHandler __call__ %s", event)
+            logger.debug(
+                "BaseHandler __call__ %s %s %s",
+                input_data,
+                callback_url,
+                gcs_signed_url,
+            )
 
             # Validate input data
             if not input_data:
                 return {"error": "No input data provided"}
 
+            # Results are only cached for direct responses (a cached result
+            # would otherwise skip the callback), keyed by the RunPod job id
+            cacheable = not callback_url and job_id != "unknown"
+            if cacheable:
+                cached_payload = _get_completed_job(job_id)
+                if cached_payload is not None:
+                    logger.info("Returning cached result for retried job %s", job_id)
+                    return cached_payload
+
             # Process the input with the model
             result = self.model.predict(input_data)
 
@@ -65,71 +333,128 @@ class BaseHandler:
             payload = {
                 "status": "success",
                 "output": result,
-                "job_id": event.get("id", "unknown"),
+                "job_id": job_id,
             }
 
             # If a GCS signed URL is provided, upload the result
+            upload_future = None
+            body = None
             if gcs_signed_url:
-                print("BaseHandler __call__ uploading to GCS", gcs_signed_url, payload)
-                output_data = result.get("output", {})
-                if isinstance(output_data, dict):
-                    image_data = output_data.get("image", output_data.get("output", ""))
-                else:
-                    image_data = output_data
-
-                if isinstance(image_data, str) and image_data.startswith("data:image"):
-                    # Extract base64 image data
-                    image_bytes = base64.b64decode(image_data.split(",")[1])
-                    upload_success = upload_to_signed_url(gcs_signed_url, image_bytes)
-                else:
-                    upload_success = upload_to_signed_url(gcs_signed_url, payload)
-
-                if upload_success:
-                    # Add information about the upload to the response
-                    payload["gcs_upload"] = "success"
+                if (
+                    self.keep_model_upload
+                    and isinstance(result, dict)
+                    and "gcs_upload" in result
+                ):
+                    payload["gcs_upload"] = result["gcs_upload"]
+                elif callback_url and self.parallel_upload:
+                    # Upload in the background while the callback is sent,
+                    # serializing the payload only once for both
+                    body = json_dumps(payload)
+                    upload_future = _IO_POOL.submit(
+                        self._upload_result, gcs_signed_url, payload, body
+                    )
                 else:
-                    # Add error information if upload failed
-                    payload["gcs_upload"] = "failed"
+                    payload["gcs_upload"] = self._upload_result(gcs_signed_url, payload)
+                if "gcs_upload" in payload:
+                    result_uploaded = payload["gcs_upload"] != "failed"
 
-            # If a callback URL is provided, send the result
+            # If a callback URL is provided, send the result (in the
+            # background if the request doesn't need to wait for it)
             if callback_url:
-                print("BaseHandler __call__ sending callback", callback_url, payload)
-                return self._handle_callback(callback_url, payload)
+                logger.debug(
+                    "BaseHandler __call__ sending callback %s %s", callback_url, payload
+                )
+                if input_data.get("callback_async"):
+                    response = self._queue_callback(callback_url, payload, body)
+                else:
+                    response = self._handle_callback(callback_url, payload, body)
+                if upload_future is not None:
+                    upload_status = upload_future.result()
+                    payload["gcs_upload"] = response["gcs_upload"] = upload_status
+                    result_uploaded = upload_status != "failed"
+                return response
 
             # If no callback URL, return the result directly
+            if (
+                cacheable
+                and isinstance(result, dict)
+                and result.get("status") == "success"
+            ):
+                _store_completed_job(job_id, payload)
             return payload
         except Exception as e:
-            # Handle errors
-            return self._handle_error(e, event)
+            # Handle errors, without replacing an already uploaded result
+            if result_uploaded:
+                gcs_signed_url = None
+            return self._handle_error(e, event, callback_url, gcs_signed_url)
 
-    def _handle_callback(self, callback_url, payload):
+    def _upload_result(self, gcs_signed_url, payload, body=None):
+        """
+        Upload a result payload to a GCS signed URL.
+
+        Base64 data URL images in the output are uploaded as image bytes;
+        anything else is uploaded as JSON.
+
+        Args:
+            gcs_signed_url (str): The GCS signed URL to upload to
+            payload (dict): The result payload
+            body (bytes, optional): The payload already serialized to JSON
+
+        Returns:
+            str: "success" or "failed"
+        """
+        logger.debug("BaseHandler uploading to GCS %s %s", gcs_signed_url, payload)
+        output_data = payload["output"].get("output", {})
+        if isinstance(output_data, dict):
+            image_data = output_data.get("image", output_data.get("output", ""))
+        else:
+            image_data = output_data
+
+        if isinstance(image_data, str) and image_data.startswith("data:image"):
+            # Extract base64 image data (partition avoids splitting the
+            # whole encoded string into a list)
+            image_bytes = base64.b64decode(image_data.partition(",")[2])
+            upload_success = upload_to_signed_url(gcs_signed_url, image_bytes)
+        elif body is not None:
+            upload_success = upload_to_signed_url(
+                gcs_signed_url, body, content_type="application/json"
+            )
+        else:
+            upload_success = upload_to_signed_url(gcs_signed_url, payload)
+
+        return "success" if upload_success else "failed"
+
+    def _post_callback(self, callback_url, payload, body=None):
+        """
+        Send a payload to a callback URL.
+
+        Args:
+            callback_url (str): URL to send the payload to
+            payload (dict): The payload to send
+            body (bytes, optional): The payload already serialized to JSON
+
+        Raises:
+            requests.RequestException: If the request fails or returns an error status
+        """
+        _post_json(self.session, callback_url, payload, self._callback_headers, body)
+
+    def _handle_callback(self, callback_url, payload, body=None):
         """
         Handle sending results to a callback URL.
 
         Args:
             callback_url (str): URL to send results to
             payload (dict): The result payload
+            body (bytes, optional): The payload already serialized to JSON
 
         Returns:
             dict: Response indicating the result was sent
         """
         try:
-            print("BaseHandler _handle_callback", callback_url, payload)
-
-            # Prepare headers with callback token if available
-            headers = {"Content-Type": "application/json"}
-            if self.callback_token:
-                headers["Authorization"] = f"Bearer {self.callback_token}"
+            logger.debug("BaseHandler _handle_callback %s %s", callback_url, payload)
 
             # Send the result to the callback URL
-            response = requests.post(
-                callback_url,
-                json=payload,
-                headers=headers,
-            )
-
-            # Check if the callback was successful
-            response.raise_for_status()
+            self._post_callback(callback_url, payload, body)
 
             # Return a message indicating the result was sent
             return {
@@ -140,27 +465,51 @@ class BaseHandler:
             }
         except Exception as callback_error:
             # Log the error but still return the result
-            print(f"Error sending result to callback URL: {str(callback_error)}")
+            logger.error("Error sending result to callback URL: %s", callback_error)
             return {
                 "status": "success",
                 "output": payload.get("output"),
-                "callback_error": str(callback_error),
+                "callback_error": _describe_callback_error(callback_error),
                 "gcs_upload": payload.get("gcs_upload"),
             }
 
-    def _handle_error(self, error, event):
+    def _queue_callback(self, callback_url, payload, body=None):
+        """
+        Queue results to be sent to a callback URL in the background.
+
+        Args:
+            callback_url (str): URL to send results to
+            payload (dict): The result payload
+            body (bytes, optional): The payload already serialized to JSON
+
+        Returns:
+            dict: Response indicating the result was queued
+        """
+        _queue_callback(
+            payload.get("job_id"), self._post_callback, callback_url, payload, body
+        )
+        return {
+            "status": "success",
+            "message": f"Result queued for callback URL: {callback_url}",
+            "job_id": payload.get("job_id"),
+            "gcs_upload": payload.get("gcs_upload"),
+        }
+
+    def _handle_error(self, error, event, callback_url=None, gcs_signed_url=None):
         """
         Handle errors during request processing.
 
         Args:
             error (Exception): The error that occurred
             event (dict): Original input event
+            callback_url (str, optional): URL to send the error to
+            gcs_signed_url (str, optional): Signed URL to upload the error to
 
         Returns:
             dict: Error response
         """
         # Log the error
-        print(f"Error processing request: {str(error)}")
+        logger.error("Error processing request: %s", error)
 
         # Prepare error payload
         error_payload = {
@@ -169,29 +518,32 @@ class BaseHandler:
             "job_id": event.get("id", "unknown"),
         }
 
-        # If a GCS signed URL is provided, try to upload the error
-        if event.get("gcs_signed_url"):
-            try:
-                upload_to_signed_url(event.get("gcs_signed_url"), error_payload)
-            except Exception as gcs_error:
-                print(f"Error uploading error to signed URL: {str(gcs_error)}")
+        # If a GCS signed URL is provided, try to upload the error (in the
+        # background if there is also a callback to send)
+        upload_future = None
+        body = None
+        if gcs_signed_url:
+            if callback_url:
+                body = json_dumps(error_payload)
+                upload_future = _IO_POOL.submit(
+                    upload_to_signed_url,
+                    gcs_signed_url,
+                    body,
+                    content_type="application/json",
+                )
+            else:
+                upload_to_signed_url(gcs_signed_url, error_payload)
 
         # If a callback URL is provided, send the error
-        if event.get("callback_url"):
+        if callback_url:
             try:
-                # Prepare headers with callback token if available
-                headers = {"Content-Type": "application/json"}
-                if self.callback_token:
-                    headers["Authorization"] = f"Bearer {self.callback_token}"
-
-                # Send the error to the callback URL
-                requests.post(
-                    event.get("callback_url"),
-                    json=error_payload,
-                    headers=headers,
-                )
+                self._post_callback(callback_url, error_payload, body)
             except Exception as callback_error:
-                print(f"Error sending error to callback URL: {str(callback_error)}")
+                logger.error("Error sending error to callback URL: %s", callback_error)
+
+        # Wait for the upload so it isn't cut off when the worker moves on
+        if upload_future is not None:
+            upload_future.result()
 
         # Return error response
         return error_payload
@@ -203,8 +555,11 @@ class BatchBaseHandler:
 
     This class handles batch requests with the format:
     { "input": { "batch": [{ ... }, { ... }] } }
+    or with the list of inputs given directly: { "input": [{ ... }, { ... }] }
 
     Each batch item can have its own gcs_signed_url for individual uploads.
+    Items are processed concurrently by the model (see BaseModel._predict_batch),
+    so downloads, inference and uploads of different items overlap.
     """
 
     def __init__(self, model_instance):
@@ -215,6 +570,7 @@ class BatchBaseHandler:
             model_instance: An instance of a class that implements the BaseModel interface
         """
         self.model = model_instance
+        self.session = get_session()
 
     def __call__(self, event):
         """
@@ -222,26 +578,32 @@ class BatchBaseHandler:
 
         Args:
             event (dict): Input event data from RunPod with format:
-                         { "input": { "batch": [{ ... }] } }
+                         { "input": { "batch": [{ ... }] } } or { "input": [{ ... }] }
 
         Returns:
             dict: The batch response
         """
+        # Extract the event fields used on both the success and error paths
+        callback_url = event.get("callback_url")
+        job_id = event.get("id", "unknown")
+
         try:
-            # Extract input data
             input_data = event.get("input", {})
-            callback_url = event.get("callback_url")
 
             # Validate input data structure
             if not input_data:
                 return {"error": "No input data provided"}
 
-            if "batch" not in input_data:
+            if isinstance(input_data, list):
+                # Accept a bare list of inputs as the batch
+                batch_items = input_data
+            elif not isinstance(input_data, dict) or "batch" not in input_data:
                 return {
                     "error": "No batch data provided. Expected format: {'input': {'batch': [...]}}"
                 }
+            else:
+                batch_items = input_data["batch"]
 
-            batch_items = input_data["batch"]
             if not isinstance(batch_items, list):
                 return {"error": "Batch data must be a list"}
 
@@ -249,17 +611,17 @@ class BatchBaseHandler:
                 return {"error": "Batch list is empty"}
 
             # Process the batch (GCS upload is now handled in model.postprocess)
-            batch_result = self.model.predict(input_data)
+            batch_result = self.model.predict_batch(batch_items)
 
             # Ensure proper format for batch results
             if "batch_results" in batch_result:
-                batch_result["job_id"] = event.get("id", "unknown")
+                batch_result["job_id"] = job_id
             else:
                 # Fallback in case something went wrong
                 batch_result = {
                     "status": "error",
                     "error": "Invalid batch result format",
-                    "job_id": event.get("id", "unknown"),
+                    "job_id": job_id,
                 }
 
             # If a callback URL is provided, send the result
@@ -271,7 +633,7 @@ class BatchBaseHandler:
 
         except Exception as e:
             # Handle errors
-            return self._handle_error(e, event)
+            return self._handle_error(e, event, callback_url)
 
     def _handle_callback(self, callback_url, payload):
         """
@@ -286,14 +648,7 @@ class BatchBaseHandler:
         """
         try:
             # Send the result to the callback URL
-            response = requests.post(
-                callback_url,
-                json=payload,
-                headers={"Content-Type": "application/json"},
-            )
-
-            # Check if the callback was successful
-            response.raise_for_status()
+            _post_json(self.session, callback_url, payload, _JSON_HEADERS)
 
             # Return a message indicating the result was sent
             return {
@@ -306,26 +661,29 @@ class BatchBaseHandler:
             }
         except Exception as callback_error:
             # Log the error but still return the result
-            print(f"Error sending batch result to callback URL: {str(callback_error)}")
+            logger.error(
+                "Error sending batch result to callback URL: %s", callback_error
+            )
             return {
                 "status": "success",
                 "output": payload,
-                "callback_error": str(callback_error),
+                "callback_error": _describe_callback_error(callback_error),
             }
 
-    def _handle_error(self, error, event):
+    def _handle_error(self, error, event, callback_url=None):
         """
         Handle errors during batch request processing.
 
         Args:
             error (Exception): The error that occurred
             event (dict): Original input event
+            callback_url (str, optional): URL to send the error to
 
         Returns:
             dict: Error response
         """
         # Log the error
-        print(f"Error processing batch request: {str(error)}")
+        logger.error("Error processing batch request: %s", error)
 
         # Prepare error payload
         error_payload = {
@@ -335,16 +693,12 @@ class BatchBaseHandler:
         }
 
         # If a callback URL is provided, send the error
-        if event.get("callback_url"):
+        if callback_url:
             try:
                 # Send the error to the callback URL
-                requests.post(
-                    event.get("callback_url"),
-                    json=error_payload,
-                    headers={"Content-Type": "application/json"},
-                )
+                _post_json(self.session, callback_url, error_payload, _JSON_HEADERS)
             except Exception as callback_error:
-                print(f"Error sending error to callback URL: {str(callback_error)}")
+                logger.error("Error sending error to callback URL: %s", callback_error)
 
         # Return error response
         return error_payload
@@ -2,19 +2,128 @@
 Base model class for AI models running on RunPod serverless endpoints.
 """
 
+import base64
+import functools
+import hashlib
+import io
 import json
+import os
+import threading
 import time
 import traceback
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
 
 import numpy as np
-import requests
 from PIL import Image
 
 from runpod_serverless_template.utils.gcs import (
+    IMAGE_SAVE_OPTIONS,
+    is_raw_array_url,
+    upload_array_to_signed_url,
     upload_image_to_signed_url,
     upload_to_signed_url,
 )
+from runpod_serverless_template.utils.http import get_session
+
+# (connect, read) timeouts in seconds for downloading input images
+IMAGE_DOWNLOAD_TIMEOUT = (3.05, 15)
+
+# Number of downloaded input images kept in memory (about 150 KB each)
+IMAGE_CACHE_SIZE = 256
+
+# Seconds a downloaded input image is reused for. Images are cached by URL, so
+# if the object behind a URL changes, requests can see the old pixels for up
+# to this long.
+IMAGE_CACHE_TTL = 60
+
+# Maximum number of image URLs in a batch downloaded at the same time
+IMAGE_PREFETCH_WORKERS = 16
+
+_PREFETCH_EXECUTOR = ThreadPoolExecutor(
+    max_workers=IMAGE_PREFETCH_WORKERS, thread_name_prefix="image-prefetch"
+)
+
+# Maximum number of image outputs uploaded in the background at the same
+# time (only used by models with blocking_upload = False)
+UPLOAD_WORKERS = 16
+
+_UPLOAD_EXECUTOR = ThreadPoolExecutor(
+    max_workers=UPLOAD_WORKERS, thread_name_prefix="gcs-upload"
+)
+
+# Batch executors kept alive across requests, keyed by worker count
+_BATCH_EXECUTORS = {}
+_BATCH_EXECUTORS_LOCK = threading.Lock()
+
+
+def _get_batch_executor(max_workers):
+    """
+    Get the shared batch executor with the given number of workers.
+
+    Executors are created once and reused, so warm workers don't start and
+    join a new set of threads on every batch request.
+
+    Args:
+        max_workers (int): Maximum number of worker threads
+
+    Returns:
+        ThreadPoolExecutor: The shared executor
+    """
+    with _BATCH_EXECUTORS_LOCK:
+        executor = _BATCH_EXECUTORS.get(max_workers)
+        if executor is None:
+            executor = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="batch"
+            )
+            _BATCH_EXECUTORS[max_workers] = executor
+        return executor
+
+
+def _load_image_pixels(image_url):
+    """
+    Download an image and resize it to the default model input size.
+
+    Results are cached by URL for up to IMAGE_CACHE_TTL seconds, so the
+    returned array is shared and read-only.
+
+    Args:
+        image_url (str): URL of the image to load
+
+    Returns:
+        numpy.ndarray: The resized image as a read-only uint8 array
+    """
+    # Entries from earlier periods are never looked up again and age out of
+    # the LRU cache
+    period = int(time.monotonic() // IMAGE_CACHE_TTL)
+    return _load_image_pixels_cached(image_url, period)
+
+
+@functools.lru_cache(maxsize=IMAGE_CACHE_SIZE)
+def _load_image_pixels_cached(image_url, period):
+    """
+    Download and resize an image, cached by URL and cache period.
+
+    Args:
+        image_url (str): URL of the image to load
+        period (int): Cache period the image is loaded in
+
+    Returns:
+        numpy.ndarray: The resized image as a read-only uint8 array
+    """
+    # Download the whole body at once (with transparent content decoding)
+    # rather than letting PIL read the raw socket stream in small chunks
+    response = get_session().get(image_url, timeout=IMAGE_DOWNLOAD_TIMEOUT)
+    response.raise_for_status()
+    img = Image.open(io.BytesIO(response.content))
+    # Let the JPEG decoder downscale large images while decoding
+    img.draft(img.mode, (224, 224))
+    # Default resize to common input size (bilinear is much cheaper than
+    # Pillow's default bicubic filter and fine for model inputs)
+    img = img.resize((224, 224), resample=Image.BILINEAR)
+    pixels = np.asarray(img)
+    pixels.flags.writeable = False
+    return pixels
 
 
 class BaseModel(ABC):
@@ -24,6 +133,45 @@ class BaseModel(ABC):
     Subclass this to implement your specific model functionality.
     """
 
+    # Preprocessing method for each recognised input key, in priority order.
+    # Subclasses can add input types without overriding preprocess, e.g.
+    # _PREPROCESSORS = {**BaseModel._PREPROCESSORS, "audio_url": "_preprocess_audio"}
+    _PREPROCESSORS = {
+        "image_url": "_preprocess_image",
+        "text": "_preprocess_text",
+    }
+
+    # Set to True to run identical items in a batch through preprocessing and
+    # inference only once. Leave disabled for non-deterministic models (e.g.
+    # sampling-based generation) where duplicates should give different
+    # results. Postprocess must not modify the raw output in place when
+    # enabled, since duplicates share it.
+    deduplicate_batch_items = False
+
+    # Format for image outputs returned inline as base64 (when no GCS signed
+    # URL is given). "JPEG" or "WEBP" make responses several times smaller
+    # than the lossless "PNG" default; images with transparency are always
+    # returned as PNG when "JPEG" is chosen.
+    base64_image_format = "PNG"
+
+    # Set to False to upload image outputs to GCS in the background. Results
+    # are then returned as soon as the image is handed off, with
+    # "gcs_upload": "pending" instead of the upload outcome, and failures are
+    # only logged. Call drain_uploads() to wait for pending uploads.
+    blocking_upload = True
+
+    # Set to False to receive image inputs from the default _preprocess_image
+    # as the cached uint8 pixels (read-only) instead of a float32 copy scaled
+    # to [0, 1]. Saves a conversion and 4x the memory per image for models
+    # that normalize on the GPU or take uint8 input; uint8 image outputs are
+    # then also uploaded without any rescaling.
+    normalize_image_inputs = True
+
+    # Set to False to skip timing each prediction. Results then report a
+    # processing_time of None, which saves the clock reads per batch item in
+    # high-throughput models that don't use the timings.
+    measure_latency = True
+
     def __init__(self):
         """
         Initialize the model.
@@ -31,6 +179,11 @@ class BaseModel(ABC):
         """
         print("Initializing base model...")
         self.model_ready = False
+        # Max parallel batch items from env var, default to 2
+        self._max_parallel = max(1, int(os.getenv("BATCH_SIZE", "2")))
+        # Background uploads not yet finished (see blocking_upload)
+        self._pending_uploads = set()
+        self._pending_uploads_lock = threading.Lock()
         self._initialize_model()
         self.model_ready = True
         print("Model initialized successfully")
@@ -54,13 +207,12 @@ class BaseModel(ABC):
             The preprocessed data ready for model prediction
         """
         # Basic implementation for common input types
-        if "image_url" in input_data:
-            return self._preprocess_image(input_data["image_url"])
-        elif "text" in input_data:
-            return self._preprocess_text(input_data["text"])
-        else:
-            # Default handling for other input types
-            return input_data
+        for key, method_name in self._PREPROCESSORS.items():
+            if key in input_data:
+                return getattr(self, method_name)(input_data[key])
+
+        # Default handling for other input types
+        return input_data
 
     def _preprocess_image(self, image_url):
         """
@@ -71,19 +223,64 @@ class BaseModel(ABC):
             image_url (str): URL of the image to process
 
         Returns:
-            numpy.ndarray: Processed image as numpy array
+            numpy.ndarray: Processed image as float32 numpy array scaled to
+            [0, 1], or as read-only uint8 pixels if normalize_image_inputs is
+            disabled
         """
         try:
-            response = requests.get(image_url, stream=True)
-            response.raise_for_status()
-            img = Image.open(response.raw)
-            # Default resize to common input size
-            img = img.resize((224, 224))
-            img_array = np.array(img) / 255.0
+            # Repeated URLs (within a batch or across requests) are served from
+            # the cache without downloading or decoding the image again
+            pixels = _load_image_pixels(image_url)
+            if not self.normalize_image_inputs:
+                return pixels
+            # Scale to [0, 1] as float32 in a single pass, into a new array so
+            # the cached pixels are never modified
+            img_array = np.empty(pixels.shape, dtype=np.float32)
+            np.multiply(pixels, np.float32(1 / 255.0), out=img_array)
             return img_array
         except Exception as e:
             raise ValueError(f"Failed to process image: {str(e)}")
 
+    def _preprocess_image_batch(self, image_urls):
+        """
+        Preprocess several images into a single stacked batch array.
+
+        Useful in _run_inference_batch implementations, or custom batch
+        preprocessing, that want one contiguous input array. Images are
+        downloaded concurrently and written straight into the output, so
+        the batch is scaled in place without an intermediate uint8 stack.
+
+        Args:
+            image_urls (list): URLs of the images to process
+
+        Returns:
+            numpy.ndarray: float32 array of shape (batch, height, width[, channels])
+            scaled to [0, 1], or uint8 pixels if normalize_image_inputs is
+            disabled
+
+        Raises:
+            ValueError: If an image can't be loaded, or the images don't all
+                have the same shape (e.g. a mix of RGB and grayscale)
+        """
+        try:
+            all_pixels = list(_PREFETCH_EXECUTOR.map(_load_image_pixels, image_urls))
+        except Exception as e:
+            raise ValueError(f"Failed to process image: {str(e)}")
+        if not all_pixels:
+            raise ValueError("No images to process")
+
+        shape = all_pixels[0].shape
+        if any(pixels.shape != shape for pixels in all_pixels):
+            raise ValueError(f"Images have different shapes, expected {shape}")
+        if not self.normalize_image_inputs:
+            return np.stack(all_pixels)
+
+        batch = np.empty((len(all_pixels),) + shape, dtype=np.float32)
+        scale = np.float32(1 / 255.0)
+        for out, pixels in zip(batch, all_pixels):
+            np.multiply(pixels, scale, out=out)
+        return batch
+
     def _preprocess_text(self, text):
         """
         Default text preprocessing implementation.
@@ -112,6 +309,32 @@ class BaseModel(ABC):
         """
         pass
 
+    def _run_inference_batch(self, processed_inputs):
+        """
+        Run model inference on several preprocessed inputs in a single call.
+        Override this method in your subclass to enable batched inference.
+
+        During batch prediction, inputs of the same type and shape are grouped
+        and passed here together, so they can be stacked (e.g. with np.stack or
+        torch.stack) and run through the model at once.
+
+        Args:
+            processed_inputs (list): Preprocessed inputs of the same type and shape
+
+        Returns:
+            list: The raw model output for each input, in the same order
+        """
+        raise NotImplementedError
+
+    def _supports_batch_inference(self):
+        """
+        Check if the subclass implements batched inference.
+
+        Returns:
+            bool: True if _run_inference_batch is overridden
+        """
+        return type(self)._run_inference_batch is not BaseModel._run_inference_batch
+
     def _is_image_output(self, output):
         """
         Check if the output is image data that should be uploaded as an image.
@@ -122,9 +345,85 @@ class BaseModel(ABC):
         Returns:
             bool: True if output should be treated as image data
         """
-        return (
-            isinstance(output, np.ndarray) and len(output.shape) >= 2
-        ) or isinstance(output, Image.Image)
+        if isinstance(output, np.ndarray):
+            return output.ndim >= 2
+        return isinstance(output, Image.Image)
+
+    def _upload_image_output(self, gcs_signed_url, image):
+        """
+        Upload an image output to a GCS signed URL.
+
+        Numpy arrays are uploaded as raw .npy data when the signed URL's object
+        name ends in .npy, skipping image encoding. Everything else is encoded
+        and uploaded as an image.
+
+        Args:
+            gcs_signed_url (str): GCS signed URL to upload to
+            image: The image output (numpy array or PIL Image)
+
+        Returns:
+            bool: True if the upload succeeded
+        """
+        if isinstance(image, np.ndarray) and is_raw_array_url(gcs_signed_url):
+            return upload_array_to_signed_url(gcs_signed_url, image)
+        return upload_image_to_signed_url(gcs_signed_url, image)
+
+    def _start_image_upload(self, gcs_signed_url, image):
+        """
+        Upload an image output, in the background if blocking_upload is off.
+
+        Args:
+            gcs_signed_url (str): GCS signed URL to upload to
+            image: The image output (numpy array or PIL Image)
+
+        Returns:
+            str: The upload status: "success", "failed" or "pending"
+        """
+        if self.blocking_upload:
+            upload_success = self._upload_image_output(gcs_signed_url, image)
+            return "success" if upload_success else "failed"
+
+        future = _UPLOAD_EXECUTOR.submit(
+            self._upload_image_output, gcs_signed_url, image
+        )
+        with self._pending_uploads_lock:
+            self._pending_uploads.add(future)
+        future.add_done_callback(self._finish_background_upload)
+        return "pending"
+
+    def _finish_background_upload(self, future):
+        """
+        Forget a finished background upload and log it if it failed.
+
+        Args:
+            future (Future): The finished upload
+        """
+        with self._pending_uploads_lock:
+            self._pending_uploads.discard(future)
+        try:
+            upload_success = future.result()
+        except Exception as e:
+            print(f"Error uploading to GCS: {str(e)}")
+            return
+        if not upload_success:
+            print("Background GCS upload failed")
+
+    def drain_uploads(self, timeout=None):
+        """
+        Wait for pending background uploads to finish.
+
+        Call this before the worker shuts down when blocking_upload is off.
+
+        Args:
+            timeout (float, optional): Maximum number of seconds to wait
+
+        Returns:
+            bool: True if all pending uploads finished within the timeout
+        """
+        with self._pending_uploads_lock:
+            pending = list(self._pending_uploads)
+        _, not_done = wait(pending, timeout=timeout)
+        return not not_done
 
     def handle_error(self, error, stage, input_data=None, gcs_signed_url=None):
         """
@@ -149,9 +448,13 @@ class BaseModel(ABC):
             "timestamp": time.time(),
         }
 
-        # Add traceback for debugging (you might want to exclude this in production)
-        if hasattr(self, "include_traceback") and self.include_traceback:
-            error_result["traceback"] = traceback.format_exc()
+        # Add traceback for debugging (you might want to exclude this in production).
+        # Formatted from the error itself, since batch items are handled after
+        # the except block that caught them has exited.
+        if getattr(self, "include_traceback", False):
+            error_result["traceback"] = "".join(
+                traceback.format_exception(type(error), error, error.__traceback__)
+            )
 
         # Add model-specific error context
         try:
@@ -215,7 +518,7 @@ class BaseModel(ABC):
         Returns:
             dict: Prediction result for the single item
         """
-        start_time = time.time()
+        start_time = time.monotonic() if self.measure_latency else None
 
         try:
             # Preprocess the input
@@ -239,7 +542,9 @@ class BaseModel(ABC):
                 return self.handle_error(e, "postprocess", raw_output, gcs_signed_url)
 
             # Calculate processing time and add metadata
-            processing_time = time.time() - start_time
+            processing_time = (
+                time.monotonic() - start_time if start_time is not None else None
+            )
 
             if isinstance(result, dict):
                 result["processing_time"] = processing_time
@@ -276,7 +581,7 @@ class BaseModel(ABC):
 
         # Check if this is a batch request
         if isinstance(input_data, dict) and "batch" in input_data:
-            return self._predict_batch(input_data["batch"])
+            return self.predict_batch(input_data["batch"])
         else:
             # Single prediction - extract GCS URL if present
             gcs_signed_url = (
@@ -286,6 +591,48 @@ class BaseModel(ABC):
             )
             return self._predict_single(input_data, gcs_signed_url=gcs_signed_url)
 
+    def predict_fast(self, input_data, gcs_signed_url=None):
+        """
+        Run prediction for a single, already validated input.
+
+        Unlike predict, this doesn't check that the model is ready, handle
+        batch inputs, or convert errors into error results; exceptions
+        propagate to the caller. The input is not modified, and the result
+        has no processing_time or status. Intended for callers like
+        benchmarks that validate inputs themselves.
+
+        Args:
+            input_data (dict): Single input item, without a GCS signed URL
+            gcs_signed_url (str, optional): GCS signed URL for uploading results
+
+        Returns:
+            dict: The postprocessed result
+        """
+        processed_input = self.preprocess(input_data)
+        raw_output = self._run_inference(processed_input)
+        return self.postprocess(raw_output, gcs_signed_url=gcs_signed_url)
+
+    def predict_batch(self, batch_items):
+        """
+        Run prediction for a list of inputs.
+
+        Items are processed concurrently. If the subclass implements
+        _run_inference_batch, compatible items also share a single inference
+        call, so only preprocessing and postprocessing are paid per item.
+
+        Args:
+            batch_items (list): List of input items, each in the same format
+                                as a single prediction input
+
+        Returns:
+            dict: Batch prediction results with metadata
+        """
+        if not self.model_ready:
+            error = RuntimeError("Model is not initialized")
+            return self.handle_error(error, "initialization", batch_items)
+
+        return self._predict_batch(batch_items)
+
     def _predict_batch(self, batch_items):
         """
         Run prediction for a batch of inputs in parallel.
@@ -296,28 +643,35 @@ class BaseModel(ABC):
         Returns:
             dict: Batch prediction results with metadata
         """
-        import os
-        from concurrent.futures import ThreadPoolExecutor, as_completed
-        from math import ceil
-
-        batch_start_time = time.time()
+        batch_start_time = time.monotonic()
 
-        # Get max parallel items from env var, default to 2
-        max_parallel = int(os.getenv("BATCH_SIZE", "2"))
+        # Download all of the batch's images up front, in parallel
+        self._prefetch_images(batch_items)
 
         # Process items in parallel batches
-        results = []
         total_items = len(batch_items)
-
-        # Process in batches to control memory usage
-        with ThreadPoolExecutor(max_workers=max_parallel) as executor:
-            # Submit all tasks
+        results = [None] * total_items
+
+        # Only as many workers as there are items are actually used, since the
+        # executor starts its threads on demand
+        max_parallel = max(1, min(self._max_parallel, total_items))
+
+        # The executor is shared and long-lived, which also bounds the number
+        # of items in flight (and so memory usage) across concurrent requests
+        executor = _get_batch_executor(self._max_parallel)
+        if self._supports_batch_inference() or self.deduplicate_batch_items:
+            # Run inference once per group of compatible or identical items
+            results = self._predict_batch_grouped(batch_items, executor)
+        else:
+            # Submit all tasks, binding the per-item lookups once
+            submit = executor.submit
+            process_item = self._process_batch_item
             future_to_idx = {
-                executor.submit(self._process_batch_item, item, idx): idx
+                submit(process_item, item, idx): idx
                 for idx, item in enumerate(batch_items)
             }
 
-            # Collect results as they complete
+            # Collect results as they complete, each into its batch position
             for future in as_completed(future_to_idx):
                 idx = future_to_idx[future]
                 try:
@@ -326,34 +680,71 @@ class BaseModel(ABC):
                     if isinstance(item_result, dict):
                         item_result["batch_index"] = idx
                     else:
-                        item_result = {"prediction": item_result, "batch_index": idx}
-                    results.append(item_result)
+                        item_result = {
+                            "prediction": item_result,
+                            "batch_index": idx,
+                        }
+                    results[idx] = item_result
                 except Exception as e:
                     # Handle any unexpected errors in parallel processing
                     error_result = self.handle_error(
                         e, "batch_processing", batch_items[idx]
                     )
                     error_result["batch_index"] = idx
-                    results.append(error_result)
-
-        # Sort results by batch index to maintain order
-        results.sort(key=lambda x: x["batch_index"])
+                    results[idx] = error_result
 
         # Calculate total processing time
-        total_processing_time = time.time() - batch_start_time
+        total_processing_time = time.monotonic() - batch_start_time
+
+        # Count outcomes in a single pass
+        successful_items = failed_items = 0
+        for result in results:
+            status = result.get("status")
+            if status == "success":
+                successful_items += 1
+            elif status == "error":
+                failed_items += 1
 
         return {
             "status": "success",
             "batch_results": results,
             "batch_size": total_items,
             "total_processing_time": total_processing_time,
-            "successful_items": len(
-                [r for r in results if r.get("status") == "success"]
-            ),
-            "failed_items": len([r for r in results if r.get("status") == "error"]),
+            "successful_items": successful_items,
+            "failed_items": failed_items,
             "parallel_workers": max_parallel,
         }
 
+    def _prefetch_images(self, batch_items):
+        """
+        Download the images of a batch concurrently into the image cache.
+
+        Batch items are otherwise downloaded by at most BATCH_SIZE workers at
+        a time. Prefetching fetches up to IMAGE_PREFETCH_WORKERS images at
+        once, so the later _preprocess_image calls are served from the cache.
+        Download errors are ignored here and reported when the item itself
+        is preprocessed.
+
+        Args:
+            batch_items (list): List of input items to process
+        """
+        # Only the default _preprocess_image reads from the image cache
+        if type(self)._preprocess_image is not BaseModel._preprocess_image:
+            return
+
+        image_urls = {
+            item["image_url"]
+            for item in batch_items
+            if isinstance(item, dict) and isinstance(item.get("image_url"), str)
+        }
+
+        # Skip single images (nothing to overlap) and batches that wouldn't fit
+        # in the cache (prefetched images would be evicted before use)
+        if len(image_urls) < 2 or len(image_urls) > IMAGE_CACHE_SIZE:
+            return
+
+        wait([_PREFETCH_EXECUTOR.submit(_load_image_pixels, url) for url in image_urls])
+
     def _process_batch_item(self, item, idx):
         """
         Process a single item from a batch.
@@ -365,18 +756,213 @@ class BaseModel(ABC):
         Returns:
             dict: The processed result for this item
         """
-        # Make a copy to avoid modifying the original
-        item_copy = item.copy() if isinstance(item, dict) else item
-
         # Extract GCS signed URL if present in this batch item
-        gcs_signed_url = (
-            item_copy.pop("gcs_signed_url", None)
-            if isinstance(item_copy, dict)
-            else None
-        )
+        item_input, gcs_signed_url = self._split_gcs_signed_url(item)
 
         # Run prediction for this item
-        return self._predict_single(item_copy, gcs_signed_url=gcs_signed_url)
+        return self._predict_single(item_input, gcs_signed_url=gcs_signed_url)
+
+    @staticmethod
+    def _split_gcs_signed_url(item):
+        """
+        Separate a batch item's GCS signed URL from its model input.
+
+        The caller's item is never modified. It is only (shallow) copied when
+        it actually carries a GCS signed URL to remove.
+
+        Args:
+            item: A batch input item
+
+        Returns:
+            tuple: The item without its GCS signed URL, and the URL (or None)
+        """
+        if not isinstance(item, dict) or "gcs_signed_url" not in item:
+            return item, None
+        item_input = item.copy()
+        return item_input, item_input.pop("gcs_signed_url")
+
+    def _predict_batch_grouped(self, batch_items, executor):
+        """
+        Run prediction for a batch in separate preprocess, inference and
+        postprocess stages.
+
+        Items are preprocessed and postprocessed concurrently on the executor.
+        If the subclass implements _run_inference_batch, inference runs once
+        per group of items with the same type and shape; other items use
+        _run_inference. With deduplicate_batch_items enabled, identical items
+        are only preprocessed and run through the model once, but each is
+        still postprocessed (and uploaded) with its own GCS signed URL.
+
+        Args:
+            batch_items (list): List of input items to process
+            executor (ThreadPoolExecutor): Executor for per-item stages
+
+        Returns:
+            list: Per-item results in batch order
+        """
+        start_time = time.monotonic() if self.measure_latency else None
+        total_items = len(batch_items)
+        item_inputs = [None] * total_items
+        gcs_signed_urls = [None] * total_items
+        processed_inputs = [None] * total_items
+        raw_outputs = [None] * total_items
+        results = [None] * total_items
+        # Preprocess/inference failures of each item, as (stage, error, data)
+        failures = [None] * total_items
+
+        # Index of the first identical item for each item, which does the work
+        # shared by all of its duplicates
+        source_indices = list(range(total_items))
+        first_index_by_key = {}
+
+        for idx, item in enumerate(batch_items):
+            item_input, gcs_signed_urls[idx] = self._split_gcs_signed_url(item)
+            item_inputs[idx] = item_input
+
+            if self.deduplicate_batch_items:
+                key = self._batch_item_key(item_input)
+                if key is not None:
+                    source_indices[idx] = first_index_by_key.setdefault(key, idx)
+
+        # Items sharing each unique item's preprocessing and inference
+        dependent_indices = {}
+        for idx in range(total_items):
+            dependent_indices.setdefault(source_indices[idx], []).append(idx)
+        unique_indices = list(dependent_indices)
+
+        # Postprocess (including GCS uploads) an item. This runs on the
+        # executor as soon as the item's inference is done, so uploads overlap
+        # with inference of the remaining groups.
+        def postprocess_item(idx):
+            source_idx = source_indices[idx]
+            failure = failures[source_idx]
+            if failure is not None:
+                stage, error, data = failure
+                result = self.handle_error(error, stage, data, gcs_signed_urls[idx])
+            else:
+                raw_output = raw_outputs[source_idx]
+                try:
+                    result = self.postprocess(
+                        raw_output, gcs_signed_url=gcs_signed_urls[idx]
+                    )
+                except Exception as e:
+                    result = self.handle_error(
+                        e, "postprocess", raw_output, gcs_signed_urls[idx]
+                    )
+                else:
+                    processing_time = (
+                        time.monotonic() - start_time
+                        if start_time is not None
+                        else None
+                    )
+                    if isinstance(result, dict):
+                        result["processing_time"] = processing_time
+                        result["status"] = "success"
+                    else:
+                        result = {
+                            "prediction": result,
+                            "processing_time": processing_time,
+                            "status": "success",
+                        }
+            result["batch_index"] = idx
+            results[idx] = result
+
+        postprocess_futures = []
+
+        def submit_postprocess(source_idx):
+            for idx in dependent_indices[source_idx]:
+                postprocess_futures.append(executor.submit(postprocess_item, idx))
+
+        # Preprocess unique items concurrently
+        def preprocess_item(idx):
+            try:
+                processed_inputs[idx] = self.preprocess(item_inputs[idx])
+            except Exception as e:
+                failures[idx] = ("preprocess", e, item_inputs[idx])
+
+        list(executor.map(preprocess_item, unique_indices))
+
+        # Group successfully preprocessed items by type and shape
+        groups = {}
+        for idx in unique_indices:
+            if failures[idx] is None:
+                key = self._batch_group_key(processed_inputs[idx])
+                groups.setdefault(key, []).append(idx)
+            else:
+                submit_postprocess(idx)
+
+        batch_inference = self._supports_batch_inference()
+        for key, indices in groups.items():
+            if batch_inference and key is not None and len(indices) > 1:
+                try:
+                    outputs = list(
+                        self._run_inference_batch(
+                            [processed_inputs[idx] for idx in indices]
+                        )
+                    )
+                    if len(outputs) != len(indices):
+                        raise ValueError(
+                            f"_run_inference_batch returned {len(outputs)} "
+                            f"outputs for {len(indices)} inputs"
+                        )
+                    for idx, raw_output in zip(indices, outputs):
+                        raw_outputs[idx] = raw_output
+                        submit_postprocess(idx)
+                    continue
+                except Exception as e:
+                    # Retry item by item so one bad input doesn't fail the group
+                    print(f"Batched inference failed, running per item: {str(e)}")
+
+            for idx in indices:
+                try:
+                    raw_outputs[idx] = self._run_inference(processed_inputs[idx])
+                except Exception as e:
+                    failures[idx] = ("inference", e, processed_inputs[idx])
+                submit_postprocess(idx)
+
+        # Wait for the remaining postprocessing and uploads
+        for future in postprocess_futures:
+            future.result()
+
+        return results
+
+    def _batch_item_key(self, item):
+        """
+        Get the key used to detect identical items within a batch.
+
+        Args:
+            item: A batch input item, without its GCS signed URL
+
+        Returns:
+            bytes: Digest of the item's content, or None if it isn't plain JSON
+                (such items are never deduplicated)
+        """
+        if isinstance(item, dict) and "callback_url" in item:
+            item = {k: v for k, v in item.items() if k != "callback_url"}
+        try:
+            content = json.dumps(item, sort_keys=True)
+        except (TypeError, ValueError):
+            return None
+        return hashlib.blake2b(content.encode("utf-8"), digest_size=16).digest()
+
+    def _batch_group_key(self, processed_input):
+        """
+        Get the key used to group preprocessed inputs for batched inference.
+
+        Args:
+            processed_input: A preprocessed input
+
+        Returns:
+            tuple: Grouping key, or None if the input can't be batched
+        """
+        shape = getattr(processed_input, "shape", None)
+        if shape is None:
+            return None
+        return (
+            type(processed_input),
+            tuple(shape),
+            getattr(processed_input, "dtype", None),
+        )
 
     def postprocess(self, output, gcs_signed_url=None):
         """
@@ -394,30 +980,38 @@ class BaseModel(ABC):
         if self._is_image_output(output):
             if gcs_signed_url:
                 try:
-                    upload_success = upload_image_to_signed_url(gcs_signed_url, output)
+                    upload_status = self._start_image_upload(gcs_signed_url, output)
                     object_name = gcs_signed_url.split("/")[-1].split("?")[0]
-                    return {
-                        "prediction": object_name,
-                        "gcs_upload": "success" if upload_success else "failed",
-                    }
+                    return {"prediction": object_name, "gcs_upload": upload_status}
                 except Exception as e:
                     print(f"Error uploading to GCS: {str(e)}")
                     return {"prediction": None, "gcs_upload": "failed", "error": str(e)}
 
             # Base64 encode the image if no GCS URL
-            import base64
-            import io
-
             # Convert numpy array to PIL Image if needed
             if isinstance(output, np.ndarray):
-                from PIL import Image
-
                 output = Image.fromarray(output)
+
+            # JPEG can't store transparency, so fall back to PNG for those
+            image_format = self.base64_image_format.upper()
+            if image_format == "JPEG" and output.mode not in ("RGB", "L"):
+                image_format = "PNG"
+
             # Convert PIL Image to base64
             buffered = io.BytesIO()
-            output.save(buffered, format="PNG")
-            img_str = base64.b64encode(buffered.getvalue()).decode()
-            return {"prediction": img_str, "encoding": "base64", "format": "png"}
+            output.save(
+                buffered,
+                format=image_format,
+                **IMAGE_SAVE_OPTIONS.get(image_format, {}),
+            )
+            # Encode straight from the buffer's memory instead of a bytes copy
+            with buffered.getbuffer() as image_bytes:
+                img_str = base64.b64encode(image_bytes).decode("ascii")
+            return {
+                "prediction": img_str,
+                "encoding": "base64",
+                "format": image_format.lower(),
+            }
 
         # Handle dictionary outputs
         if isinstance(output, dict):
@@ -430,12 +1024,12 @@ class BaseModel(ABC):
                 and self._is_image_output(result["prediction"])
             ):
                 try:
-                    upload_success = upload_image_to_signed_url(
+                    upload_status = self._start_image_upload(
                         gcs_signed_url, result["prediction"]
                     )
                     object_name = gcs_signed_url.split("/")[-1].split("?")[0]
                     result["prediction"] = object_name
-                    result["gcs_upload"] = "success" if upload_success else "failed"
+                    result["gcs_upload"] = upload_status
                     return result
                 except Exception as e:
                     print(f"Error uploading to GCS: {str(e)}")
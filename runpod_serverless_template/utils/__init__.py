@@ -3,8 +3,15 @@ Utility functions for RunPod serverless endpoints.
 """
 
 from runpod_serverless_template.utils.gcs import (
+    upload_array_to_signed_url,
     upload_image_to_signed_url,
     upload_to_signed_url,
 )
+from runpod_serverless_template.utils.http import get_session
 
-__all__ = ["upload_to_signed_url", "upload_image_to_signed_url"]
+__all__ = [
+    "upload_to_signed_url",
+    "upload_image_to_signed_url",
+    "upload_array_to_signed_url",
+    "get_session",
+]
@@ -0,0 +1,44 @@
+"""
+HTTP utilities for RunPod serverless endpoints.
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+# Maximum number of pooled connections kept per host. Batch items upload to
+# the same GCS host concurrently, so this should cover the batch parallelism.
+POOL_MAXSIZE = 32
+
+# Shared across uploads, downloads and callbacks so that repeated requests
+# (including concurrent batch items) reuse keep-alive connections instead of
+# paying a new TCP + TLS handshake each time.
+_SESSION = requests.Session()
+# Retry connection failures and transient server errors with jittered
+# exponential backoff, honouring Retry-After. Only idempotent methods (GET and
+# the PUT uploads to signed URLs) are retried on error statuses, so callback
+# POSTs are never sent twice.
+RETRY = Retry(
+    total=3,
+    backoff_factor=0.25,
+    backoff_jitter=0.1,
+    status_forcelist=(429, 500, 502, 503, 504),
+)
+
+_ADAPTER = HTTPAdapter(
+    pool_connections=POOL_MAXSIZE,
+    pool_maxsize=POOL_MAXSIZE,
+    max_retries=RETRY,
+)
+_SESSION.mount("https://", _ADAPTER)
+_SESSION.mount("http://", _ADAPTER)
+
+
+def get_session():
+    """
+    Get the shared HTTP session for outbound requests.
+
+    Returns:
+        requests.Session: The process-wide session
+    """
+    return _SESSION
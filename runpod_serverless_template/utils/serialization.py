@@ -0,0 +1,93 @@
+"""
+JSON serialization utilities for RunPod serverless endpoints.
+"""
+
+import json
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_default(obj):
+    """
+    Convert values the JSON encoder can't serialize natively.
+
+    Args:
+        obj: The value to convert
+
+    Returns:
+        A JSON-serializable equivalent of the value
+    """
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def json_dumps(data):
+    """
+    Serialize data to UTF-8 encoded JSON.
+
+    Uses orjson when it is installed (much faster, and encodes numpy arrays
+    natively), otherwise falls back to the standard library json module.
+
+    Args:
+        data: The data to serialize
+
+    Returns:
+        bytes: The JSON document
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            data,
+            default=_json_default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        )
+    return json.dumps(data, default=_json_default).encode("utf-8")
+
+
+def json_dumps_pretty(data):
+    """
+    Serialize data to an indented JSON string for printing.
+
+    Uses orjson when it is installed, otherwise the standard library json
+    module. Numpy values are handled as in json_dumps.
+
+    Args:
+        data: The data to serialize
+
+    Returns:
+        str: The JSON document, indented by two spaces
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            data,
+            default=_json_default,
+            option=orjson.OPT_INDENT_2
+            | orjson.OPT_SERIALIZE_NUMPY
+            | orjson.OPT_NON_STR_KEYS,
+        ).decode("utf-8")
+    return json.dumps(data, indent=2, default=_json_default)
+
+
+def json_loads(data):
+    """
+    Deserialize a JSON document.
+
+    Uses orjson when it is installed, otherwise the standard library json
+    module.
+
+    Args:
+        data (bytes or str): The JSON document
+
+    Returns:
+        The deserialized data
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -5,14 +5,58 @@ before deploying it to RunPod.
 """
 
 import argparse
-import json
+import io
 import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
-# Add the parent directory to sys.path to make src module importable
+# Add the parent directory to sys.path to make the entry point importable
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.handler import handler
+# The model is only loaded when the handler is first called
+from handler import handler
+from runpod_serverless_template.utils.serialization import json_dumps_pretty
+
+
+class ThreadBufferedStdout:
+    """Stdout replacement that collects output separately for each test thread."""
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+
+    def write(self, text):
+        buffer = getattr(self._local, "buffer", None)
+        return (buffer or self._stream).write(text)
+
+    def flush(self):
+        self._stream.flush()
+
+    def capture(self, test):
+        """Run a test, returning everything it printed from this thread."""
+        self._local.buffer = io.StringIO()
+        try:
+            test()
+        finally:
+            output = self._local.buffer.getvalue()
+            self._local.buffer = None
+        return output
+
+
+def run_concurrently(tests):
+    """Run tests in parallel, printing each test's output in order."""
+    original_stdout = sys.stdout
+    stdout = ThreadBufferedStdout(original_stdout)
+    sys.stdout = stdout
+    try:
+        with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+            futures = [executor.submit(stdout.capture, test) for test in tests]
+            outputs = [future.result() for future in futures]
+    finally:
+        sys.stdout = original_stdout
+    for output in outputs:
+        print(output, end="")
 
 
 def parse_args():
@@ -33,12 +77,12 @@ def test_image_url():
     }
 
     print("\n==== Testing with image URL ====")
-    print(f"Input: {json.dumps(test_event, indent=2)}")
+    print(f"Input: {json_dumps_pretty(test_event)}")
 
     # Call the handler
     result = handler(test_event)
 
-    print(f"Output: {json.dumps(result, indent=2)}")
+    print(f"Output: {json_dumps_pretty(result)}")
 
 
 def test_text():
@@ -46,12 +90,12 @@ def test_text():
     test_event = {"input": {"text": "This is a sample text for testing."}}
 
     print("\n==== Testing with text input ====")
-    print(f"Input: {json.dumps(test_event, indent=2)}")
+    print(f"Input: {json_dumps_pretty(test_event)}")
 
     # Call the handler
     result = handler(test_event)
 
-    print(f"Output: {json.dumps(result, indent=2)}")
+    print(f"Output: {json_dumps_pretty(result)}")
 
 
 def test_empty_input():
@@ -59,12 +103,12 @@ def test_empty_input():
     test_event = {"input": {}}
 
     print("\n==== Testing with empty input ====")
-    print(f"Input: {json.dumps(test_event, indent=2)}")
+    print(f"Input: {json_dumps_pretty(test_event)}")
 
     # Call the handler
     result = handler(test_event)
 
-    print(f"Output: {json.dumps(result, indent=2)}")
+    print(f"Output: {json_dumps_pretty(result)}")
 
 
 def test_with_callback():
@@ -76,13 +120,13 @@ def test_with_callback():
     }
 
     print("\n==== Testing with callback URL ====")
-    print(f"Input: {json.dumps(test_event, indent=2)}")
+    print(f"Input: {json_dumps_pretty(test_event)}")
     print("NOTE: The callback URL won't actually be called in local testing.")
 
     # Call the handler
     result = handler(test_event)
 
-    print(f"Output: {json.dumps(result, indent=2)}")
+    print(f"Output: {json_dumps_pretty(result)}")
 
 
 def test_with_gcs_signed_url(signed_url=None):
@@ -105,7 +149,7 @@ def test_with_gcs_signed_url(signed_url=None):
     redacted_event["gcs_signed_url"] = (
         "(real signed url)" if signed_url else actual_signed_url
     )
-    print(f"Input: {json.dumps(redacted_event, indent=2)}")
+    print(f"Input: {json_dumps_pretty(redacted_event)}")
 
     if not signed_url:
         print("NOTE: Using example signed URL that won't work in real testing.")
@@ -115,7 +159,7 @@ def test_with_gcs_signed_url(signed_url=None):
     # Call the handler
     result = handler(test_event)
 
-    print(f"Output: {json.dumps(result, indent=2)}")
+    print(f"Output: {json_dumps_pretty(result)}")
 
 
 def test_with_callback_and_gcs(signed_url=None):
@@ -139,7 +183,7 @@ def test_with_callback_and_gcs(signed_url=None):
     redacted_event["gcs_signed_url"] = (
         "(real signed url)" if signed_url else actual_signed_url
     )
-    print(f"Input: {json.dumps(redacted_event, indent=2)}")
+    print(f"Input: {json_dumps_pretty(redacted_event)}")
 
     if not signed_url:
         print("NOTE: Using example signed URL that won't work in real testing.")
@@ -150,7 +194,7 @@ def test_with_callback_and_gcs(signed_url=None):
     # Call the handler
     result = handler(test_event)
 
-    print(f"Output: {json.dumps(result, indent=2)}")
+    print(f"Output: {json_dumps_pretty(result)}")
 
 
 if __name__ == "__main__":
@@ -159,12 +203,17 @@ if __name__ == "__main__":
     # Parse command line arguments
     args = parse_args()
 
-    # Run test cases
-    test_image_url()
-    test_text()
-    test_empty_input()
-    test_with_callback()
-    test_with_gcs_signed_url(args.signed_url)
-    test_with_callback_and_gcs(args.signed_url)
+    # Run test cases concurrently, since most of their time is spent on
+    # network requests
+    run_concurrently(
+        [
+            test_image_url,
+            test_text,
+            test_empty_input,
+            test_with_callback,
+            lambda: test_with_gcs_signed_url(args.signed_url),
+            lambda: test_with_callback_and_gcs(args.signed_url),
+        ]
+    )
 
     print("\nLocal testing completed!")